@@ -1,24 +1,54 @@
 VERSION = 2
+import base64
+import copy
+import hashlib
 import os
+import shutil
 import subprocess
-from datetime import datetime
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import argparse
 
 import yaml
 import boto3
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.compat import HAS_CRT
+from botocore.config import Config
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+if HAS_CRT:
+    from s3transfer.crt import CRTTransferManager
 
 
 class ConfigError(Exception):
     pass
 
 
+_CONFIG_CACHE = {}
+
+
 def load_config(file_path: Path):
-    _, ext = os.path.splitext(file_path)
-    if ext not in [".yaml", ".yml"]:
-        raise ConfigError(f"Unsupported file extension: {ext}")
-    with open(file_path, "rb") as f:
-        return yaml.safe_load(f)
+    if not str(file_path).endswith((".yaml", ".yml")):
+        raise ConfigError(f"Unsupported file extension: {os.path.splitext(file_path)[1]}")
+    st = os.stat(file_path)
+    path = str(file_path)
+    cached = _CONFIG_CACHE.get(path)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        config = cached[2]
+    else:
+        with open(file_path, "rb") as f:
+            config = yaml.load(f, Loader=YamlLoader)
+        # One entry per path: an edited config replaces its previous version.
+        _CONFIG_CACHE[path] = (st.st_mtime_ns, st.st_size, config)
+    # Callers get their own copy so they can't change what the next caller sees.
+    return copy.deepcopy(config)
 
 
 def get_config_path():
@@ -37,23 +67,84 @@ def log(message):
     print(message)
 
 
+STDERR_LIMIT = 1024 * 1024
+
+
+def _drain(stream, spool):
+    for chunk in iter(lambda: stream.read(64 * 1024), b""):
+        spool.write(chunk)
+
+
+def _spool_tail(spool):
+    spool.seek(max(0, spool.tell() - STDERR_LIMIT))
+    return spool.read()
+
+
+def run_command(cmd, stdout=subprocess.PIPE, env=None):
+    # stderr is drained on its own thread so a chatty child never blocks on a full pipe.
+    with tempfile.SpooledTemporaryFile(max_size=STDERR_LIMIT) as spool:
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=stdout,
+            stderr=subprocess.PIPE,
+            env=env,
+            bufsize=0,
+        )
+        drain = threading.Thread(target=_drain, args=(proc.stderr, spool), daemon=True)
+        drain.start()
+        output = None
+        if proc.stdout:
+            output = proc.stdout.read()
+            proc.stdout.close()
+        proc.wait()
+        drain.join()
+        proc.stderr.close()
+
+        # stderr is only ever logged on failure; keep the tail, where the error is.
+        stderr = b""
+        if proc.returncode != 0:
+            stderr = _spool_tail(spool)
+    return subprocess.CompletedProcess(cmd, proc.returncode, output, stderr)
+
+
 class Compressor:
-    def compress(self, file_path: Path, method: str):
+    extensions = {"gzip": ".gz", "bzip2": ".bz2", "zstd": ".zst"}
+
+    def __init__(self, default_threads=None):
+        self.default_threads = default_threads
+        self.pigz = shutil.which("pigz") is not None
+        self.pbzip2 = shutil.which("pbzip2") is not None
+
+    def command(self, method: str, threads=None, level=None):
+        threads = threads or self.default_threads
+        if method == "zstd":
+            return ["zstd", f"-T{int(threads or 0)}", f"-{int(3 if level is None else level)}"]
+        level_args = [f"-{int(level)}"] if level is not None else []
+        threads = int(threads or os.cpu_count() or 1)
+        if method == "gzip":
+            if self.pigz:
+                return ["pigz", "-p", str(threads)] + level_args
+            return ["gzip"] + level_args
+        if method == "bzip2":
+            if self.pbzip2:
+                return ["pbzip2", f"-p{threads}"] + level_args
+            return ["bzip2"] + level_args
+        return None
+
+    def compress(self, file_path: Path, method: str, threads=None, level=None):
         try:
-            if method == "gzip":
-                subprocess.run(["gzip", str(file_path)], check=True)
-                new_path = file_path.with_suffix(file_path.suffix + ".gz")
-                log(f"COMPRESSED {file_path.name} -> {new_path.name}")
-                return new_path
-
-            if method == "bzip2":
-                subprocess.run(["bzip2", str(file_path)], check=True)
-                new_path = file_path.with_suffix(file_path.suffix + ".bz2")
-                log(f"COMPRESSED {file_path.name} -> {new_path.name}")
-                return new_path
-
-            log(f"ERROR, not supported: {method}")
-            return None
+            cmd = self.command(method, threads, level)
+            if not cmd:
+                log(f"ERROR, not supported: {method}")
+                return None
+            if method == "zstd":
+                cmd.extend(["-q", "--rm"])
+
+            subprocess.run(cmd + [str(file_path)], check=True)
+            new_path = file_path.with_suffix(file_path.suffix + self.extensions[method])
+            log(f"COMPRESSED {file_path.name} -> {new_path.name}")
+            return new_path
 
         except subprocess.CalledProcessError as exc:
             log(f"ERROR, compressing file {file_path.name}: {exc}")
@@ -61,29 +152,26 @@ class Compressor:
 
 
 class Encryptor:
-    def encrypt(self, file_path: Path, encryption):
+    def command(self, encryption, compressed=False, output="-"):
+        if encryption.get("method") == "gpg":
+            args = ["gpg", "--batch", "--yes", "--cipher-algo", "AES256"]
+            if compressed:
+                # The payload is already compressed, gpg's zlib pass only burns CPU.
+                args.extend(["--compress-algo", "none"])
+            return args + ["--output", output, "--encrypt", "--recipient", encryption["recipient"]]
+        return None
+
+    def encrypt(self, file_path: Path, encryption, compressed=False):
         try:
-            if encryption.get("method") == "gpg":
-                encrypted_path = file_path.with_suffix(file_path.suffix + ".gpg")
-                subprocess.run(
-                    [
-                        "gpg",
-                        "--batch",
-                        "--yes",
-                        "--output",
-                        str(encrypted_path),
-                        "--encrypt",
-                        "--recipient",
-                        encryption["recipient"],
-                        str(file_path),
-                    ],
-                    check=True,
-                )
-                log(f"ENCRYPTED {file_path.name} -> {encrypted_path.name}")
-                return encrypted_path
+            encrypted_path = file_path.with_suffix(file_path.suffix + ".gpg")
+            cmd = self.command(encryption, compressed, str(encrypted_path))
+            if not cmd:
+                log(f"ERROR, not supported: {encryption.get('method')}")
+                return None
 
-            log(f"ERROR, not supported: {encryption.get('method')}")
-            return None
+            subprocess.run(cmd + [str(file_path)], check=True)
+            log(f"ENCRYPTED {file_path.name} -> {encrypted_path.name}")
+            return encrypted_path
 
         except subprocess.CalledProcessError as exc:
             log(f"ERROR encrypting file {file_path.name}: {exc}")
@@ -91,9 +179,173 @@ class Encryptor:
 
 
 class Uploader:
+    multipart_limit = 100 * 1024 * 1024
+    part_size = 16 * 1024 * 1024
+    part_workers = 10
+
+    def __init__(self):
+        self.transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=16 * 1024 * 1024,
+            max_concurrency=min(16, (os.cpu_count() or 1) * 2),
+            io_chunksize=8 * 1024 * 1024,
+            use_threads=True,
+        )
+        self.client_config = Config(
+            retries={"mode": "adaptive", "max_attempts": 10},
+            max_pool_connections=32,
+        )
+        # With awscrt installed (boto3[crt]) file uploads go through the native CRT
+        # transfer client, which runs multipart in C instead of Python threads.
+        self.crt_transfer_config = None
+        if HAS_CRT:
+            self.crt_transfer_config = TransferConfig(
+                preferred_transfer_client="crt",
+                multipart_threshold=8 * 1024 * 1024,
+                multipart_chunksize=16 * 1024 * 1024,
+            )
+        self._clients = {}
+        self._managers = {}
+        self._clients_lock = threading.Lock()
+
     def upload(self, file_path: Path, destination):
         try:
             if destination.get("method") == "s3":
+                s3 = self._s3_client(destination)
+                bucket, key = self._s3_target(destination, file_path.name)
+
+                manager = self._crt_manager(destination, s3) if self.crt_transfer_config else None
+                if manager:
+                    future = manager.upload(
+                        str(file_path), bucket, key, extra_args={"ChecksumAlgorithm": "SHA256"}
+                    )
+                    future.result()
+                elif file_path.stat().st_size > self.multipart_limit:
+                    self._multipart_upload(s3, file_path, bucket, key)
+                else:
+                    s3.upload_file(
+                        str(file_path),
+                        bucket,
+                        key,
+                        ExtraArgs={"ChecksumAlgorithm": "SHA256"},
+                        Config=self.transfer_config,
+                    )
+                log(f"UPLOADED {file_path.name} -> s3://{bucket}/{key}")
+                return True
+
+            log(f"ERROR, Not supported: {destination.get('method')}")
+            return False
+
+        except Exception as exc:
+            log(f"ERROR uploading: {exc}")
+            return False
+
+    def upload_stream(self, stream, name, destination):
+        try:
+            if destination.get("method") == "s3":
+                s3 = self._s3_client(destination)
+                bucket, key = self._s3_target(destination, name)
+
+                s3.upload_fileobj(
+                    stream,
+                    bucket,
+                    key,
+                    ExtraArgs={"ChecksumAlgorithm": "SHA256"},
+                    Config=self.transfer_config,
+                )
+                log(f"UPLOADED {name} -> s3://{bucket}/{key}")
+                return True
+
+            log(f"ERROR, Not supported: {destination.get('method')}")
+            return False
+
+        except Exception as exc:
+            log(f"ERROR uploading: {exc}")
+            return False
+
+    def _multipart_upload(self, s3, file_path: Path, bucket, key):
+        size = file_path.stat().st_size
+        # S3 allows at most 10000 parts per upload.
+        part_size = max(self.part_size, -(-size // 10000))
+        upload_id = s3.create_multipart_upload(Bucket=bucket, Key=key, ChecksumAlgorithm="SHA256")["UploadId"]
+        try:
+            with ThreadPoolExecutor(max_workers=self.part_workers) as pool:
+                futures = [
+                    pool.submit(
+                        self._upload_part, s3, file_path, bucket, key, upload_id, number, offset, part_size
+                    )
+                    for number, offset in enumerate(range(0, size, part_size), start=1)
+                ]
+                try:
+                    parts = [future.result() for future in futures]
+                except Exception:
+                    # Don't keep sending the remaining parts of an upload we are about to abort.
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    raise
+            s3.complete_multipart_upload(
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+            raise
+
+    def _upload_part(self, s3, file_path: Path, bucket, key, upload_id, number, offset, length):
+        with open(file_path, "rb") as f:
+            f.seek(offset)
+            reader = HashingReader(f)
+            data = reader.read(length)
+        checksum = reader.b64digest()
+
+        # Transient errors are retried per part by the client's adaptive retry mode.
+        response = s3.upload_part(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=number,
+            Body=data,
+            ChecksumAlgorithm="SHA256",
+            ChecksumSHA256=checksum,
+        )
+        return {"ETag": response["ETag"], "ChecksumSHA256": checksum, "PartNumber": number}
+
+    def close(self):
+        with self._clients_lock:
+            for manager in self._managers.values():
+                if manager:
+                    manager.shutdown()
+            self._managers.clear()
+
+    def _client_key(self, destination):
+        return (
+            destination.get("AWS_ACCESS_KEY_ID"),
+            destination.get("AWS_SECRET_ACCESS_KEY"),
+            destination.get("AWS_SESSION_TOKEN"),
+            destination.get("region"),
+        )
+
+    def _crt_manager(self, destination, s3):
+        cache_key = self._client_key(destination)
+        with self._clients_lock:
+            if cache_key not in self._managers:
+                manager = create_transfer_manager(s3, self.crt_transfer_config)
+                # boto3 hands back a classic manager when awscrt is too old or the client
+                # doesn't match the process-wide CRT client; keep our own classic path then.
+                if not isinstance(manager, CRTTransferManager):
+                    manager.shutdown()
+                    manager = None
+                    log(f"INFO, CRT transfer client not available for s3://{destination.get('S3_BUCKET')}")
+                self._managers[cache_key] = manager
+            return self._managers[cache_key]
+
+    def _s3_client(self, destination):
+        cache_key = self._client_key(destination)
+        # boto3 client creation is not thread safe, and tasks upload concurrently.
+        with self._clients_lock:
+            s3 = self._clients.get(cache_key)
+            if s3 is None:
                 client_kwargs = {}
                 if destination.get("AWS_ACCESS_KEY_ID"):
                     client_kwargs["aws_access_key_id"] = destination["AWS_ACCESS_KEY_ID"]
@@ -101,107 +353,264 @@ class Uploader:
                     client_kwargs["aws_secret_access_key"] = destination["AWS_SECRET_ACCESS_KEY"]
                 if destination.get("AWS_SESSION_TOKEN"):
                     client_kwargs["aws_session_token"] = destination["AWS_SESSION_TOKEN"]
+                if destination.get("region"):
+                    client_kwargs["region_name"] = destination["region"]
+                s3 = boto3.client("s3", config=self.client_config, **client_kwargs)
+                self._clients[cache_key] = s3
+            return s3
 
-                s3 = boto3.client("s3", **client_kwargs)
-                bucket = destination["S3_BUCKET"]
-                prefix = destination.get("prefix", "").strip("/")
-                key = f"{prefix}/{file_path.name}" if prefix else file_path.name
+    def _s3_target(self, destination, name):
+        bucket = destination["S3_BUCKET"]
+        prefix = destination.get("prefix", "").strip("/")
+        key = f"{prefix}/{name}" if prefix else name
+        return bucket, key
 
-                s3.upload_file(str(file_path), bucket, key)
-                log(f"UPLOADED {file_path.name} -> s3://{bucket}/{key}")
-                return True
 
-            log(f"ERROR, Not supported: {destination.get('method')}")
-            return False
+class HashingReader:
+    def __init__(self, stream):
+        self.stream = stream
+        self.hash = hashlib.sha256()
 
-        except Exception as exc:
-            log(f"ERROR uploading: {exc}")
-            return False
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.hash.update(data)
+        return data
+
+    def b64digest(self):
+        return base64.b64encode(self.hash.digest()).decode()
+
+
+class PipelineReader:
+    def __init__(self, processes):
+        self.processes = processes
+        self.stream = processes[-1].stdout
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        if not data:
+            self.check()
+        return data
+
+    def check(self):
+        for proc in self.processes:
+            if proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, proc.args[0])
+
+
+class JobLimiter:
+    def __init__(self, size):
+        self.size = size
+        self._slots = threading.BoundedSemaphore(size)
+
+    def run(self, func, *args):
+        with self._slots:
+            return func(*args)
 
 
 class BackupTask:
+    source_type = None
+
     def run(self):
+        sources = self.source_config or {}
+        if not sources:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(sources), self.limiter.size)) as pool:
+            futures = [pool.submit(self.run_source, name, sources[name]) for name in sources]
+            for future in futures:
+                future.result()
+
+    def run_source(self, name, cfg):
         raise NotImplementedError
 
+    def _temp_dir(self, name, cfg):
+        if not cfg.get("temp"):
+            log(f"ERROR, missing temp path for source {name}")
+            return None
+        # Sources run concurrently and often share temp, so each one gets its own subdirectory.
+        temp_dir = Path(cfg["temp"]) / self.source_type / str(name)
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        return temp_dir
+
 
 class MySQLDumpTask(BackupTask):
-    def __init__(self, source_config, destinations, encryptions, compressor, encryptor, uploader):
+    source_type = "mysqldump"
+
+    def __init__(self, source_config, destinations, encryptions, compressor, encryptor, uploader, limiter):
         self.source_config = source_config
         self.destinations = destinations or {}
         self.encryptions = encryptions or {}
         self.compressor = compressor
         self.encryptor = encryptor
         self.uploader = uploader
+        self.limiter = limiter
         self.system_databases = ["mysql", "information_schema", "performance_schema", "sys"]
+        self.default_dump_flags = ["--single-transaction", "--quick", "--skip-lock-tables"]
+        self.local_hosts = {"localhost", "127.0.0.1", "::1"}
 
-    def run(self):
-        for name in self.source_config:
-            cfg = self.source_config[name]
-            temp_dir = Path(cfg.get("temp", ""))
-            if not str(temp_dir):
-                log(f"ERROR, missing temp path for source {name}")
-                continue
-            temp_dir.mkdir(parents=True, exist_ok=True)
-
-            all_except_system = cfg.get("all_databases_except_system", False)
-            databases = cfg.get("databases") or []
-            if all_except_system:
-                exclude = cfg.get("exclude_databases") or self.system_databases
-                databases = self._list_databases(cfg, exclude)
-                if not databases:
-                    log(f"ERROR, no databases found for source {name}")
-                    continue
-            elif not databases:
-                log(f"ERROR, no databases listed for source {name}")
-                continue
+    def run_source(self, name, cfg):
+        temp_dir = None
+        if not cfg.get("stream"):
+            temp_dir = self._temp_dir(name, cfg)
+            if not temp_dir:
+                return
 
-            compress_method = cfg.get("compress")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-
-            for db in databases:
-                dump_file = temp_dir / f"{db}_{timestamp}.sql"
-                cmd = self._mysqldump_cmd(cfg, db)
-                env = self._mysql_env(cfg)
-
-                with open(dump_file, "wb") as f:
-                    result = subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE, env=env)
-
-                if result.returncode != 0:
-                    log(f"Error dumping {db}: {result.stderr.decode(errors='replace')}")
-                    continue
-
-                log(f"DUMPED {db} -> {dump_file}")
-
-                if compress_method:
-                    compressed_file = self.compressor.compress(dump_file, compress_method)
-                    if not compressed_file:
-                        continue
-                    dump_file = compressed_file
-
-                encryption_key = cfg.get("encryption")
-                if encryption_key:
-                    encryption_cfg = self.encryptions.get(encryption_key)
-                    if not encryption_cfg:
-                        log(f"ERROR, encryption not found: {encryption_key}")
-                        continue
-                    encrypted_file = self.encryptor.encrypt(dump_file, encryption_cfg)
-                    if not encrypted_file:
-                        continue
-                    if dump_file.exists():
-                        dump_file.unlink()
-                    dump_file = encrypted_file
-
-                destination_key = cfg.get("destination")
-                if destination_key:
-                    destination_cfg = self.destinations.get(destination_key)
-                    if not destination_cfg:
-                        log(f"ERROR, destination not found: {destination_key}")
-                        continue
-                    uploaded = self.uploader.upload(dump_file, destination_cfg)
-                    if uploaded and cfg.get("cleanup", True):
-                        dump_file.unlink()
-                else:
-                    log(f"INFO, no destination configured for {dump_file.name}")
+        env = self._mysql_env(cfg)
+        all_except_system = cfg.get("all_databases_except_system", False)
+        databases = cfg.get("databases") or []
+        if all_except_system:
+            exclude = cfg.get("exclude_databases") or self.system_databases
+            databases = self._list_databases(cfg, exclude, env)
+            if not databases:
+                log(f"ERROR, no databases found for source {name}")
+                return
+        elif not databases:
+            log(f"ERROR, no databases listed for source {name}")
+            return
+
+        timestamp = time.strftime("%Y%m%d_%H%M", time.localtime())
+        dump_cmd = self._mysqldump_cmd(cfg)
+
+        workers = min(max(1, int(cfg.get("parallel_databases", 4))), self.limiter.size)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self.limiter.run, self._backup_database, cfg, db, temp_dir, timestamp, dump_cmd, env)
+                for db in databases
+            ]
+            for future in futures:
+                future.result()
+
+    def _backup_database(self, cfg, db, temp_dir, timestamp, dump_cmd, env):
+        if cfg.get("stream"):
+            self._stream_dump(cfg, db, timestamp, dump_cmd, env)
+            return
+
+        compress_method = cfg.get("compress")
+        dump_file = temp_dir / f"{db}_{timestamp}.sql"
+
+        with open(dump_file, "wb") as f:
+            result = run_command(dump_cmd + [db], stdout=f, env=env)
+
+        if result.returncode != 0:
+            log(f"Error dumping {db}: {result.stderr.decode(errors='replace')}")
+            return
+
+        log(f"DUMPED {db} -> {dump_file}")
+
+        if compress_method:
+            compressed_file = self.compressor.compress(
+                dump_file,
+                compress_method,
+                cfg.get("compress_threads"),
+                cfg.get("compress_level"),
+            )
+            if not compressed_file:
+                return
+            dump_file = compressed_file
+
+        encryption_key = cfg.get("encryption")
+        if encryption_key:
+            encryption_cfg = self.encryptions.get(encryption_key)
+            if not encryption_cfg:
+                log(f"ERROR, encryption not found: {encryption_key}")
+                return
+            encrypted_file = self.encryptor.encrypt(dump_file, encryption_cfg, bool(compress_method))
+            if not encrypted_file:
+                return
+            if dump_file.exists():
+                dump_file.unlink()
+            dump_file = encrypted_file
+
+        destination_key = cfg.get("destination")
+        if destination_key:
+            destination_cfg = self.destinations.get(destination_key)
+            if not destination_cfg:
+                log(f"ERROR, destination not found: {destination_key}")
+                return
+            uploaded = self.uploader.upload(dump_file, destination_cfg)
+            if uploaded and cfg.get("cleanup", True):
+                dump_file.unlink()
+        else:
+            log(f"INFO, no destination configured for {dump_file.name}")
+
+    def _stream_dump(self, cfg, db, timestamp, dump_cmd, env):
+        destination_key = cfg.get("destination")
+        if not destination_key:
+            log(f"ERROR, stream requires a destination for {db}")
+            return
+        destination_cfg = self.destinations.get(destination_key)
+        if not destination_cfg:
+            log(f"ERROR, destination not found: {destination_key}")
+            return
+
+        name = f"{db}_{timestamp}.sql"
+        commands = [dump_cmd + [db]]
+
+        compress_method = cfg.get("compress")
+        if compress_method:
+            program = self.compressor.command(
+                compress_method, cfg.get("compress_threads"), cfg.get("compress_level")
+            )
+            if not program:
+                log(f"ERROR, not supported: {compress_method}")
+                return
+            commands.append(program + ["-c"])
+            name += self.compressor.extensions[compress_method]
+
+        encryption_key = cfg.get("encryption")
+        if encryption_key:
+            encryption_cfg = self.encryptions.get(encryption_key)
+            if not encryption_cfg:
+                log(f"ERROR, encryption not found: {encryption_key}")
+                return
+            program = self.encryptor.command(encryption_cfg, bool(compress_method))
+            if not program:
+                log(f"ERROR, not supported: {encryption_cfg.get('method')}")
+                return
+            commands.append(program)
+            name += ".gpg"
+
+        processes = []
+        drain = None
+        uploaded = False
+        with tempfile.SpooledTemporaryFile(max_size=STDERR_LIMIT) as spool:
+            try:
+                for cmd in commands:
+                    if not processes:
+                        # Only mysqldump needs MYSQL_PWD, and only its stderr is worth logging.
+                        proc = subprocess.Popen(
+                            cmd,
+                            stdin=subprocess.DEVNULL,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE,
+                            env=env,
+                        )
+                        drain = threading.Thread(target=_drain, args=(proc.stderr, spool), daemon=True)
+                        drain.start()
+                    else:
+                        proc = subprocess.Popen(cmd, stdin=processes[-1].stdout, stdout=subprocess.PIPE)
+                        # Let upstream processes get SIGPIPE if a downstream one exits.
+                        processes[-1].stdout.close()
+                    processes.append(proc)
+
+                uploaded = self.uploader.upload_stream(PipelineReader(processes), name, destination_cfg)
+            finally:
+                for proc in processes:
+                    if proc.poll() is None:
+                        proc.kill()
+                    proc.wait()
+                if processes:
+                    processes[-1].stdout.close()
+                if drain:
+                    drain.join()
+                    processes[0].stderr.close()
+
+            # A negative code means we killed it after a downstream failure.
+            if processes and processes[0].returncode > 0:
+                log(f"Error dumping {db}: {_spool_tail(spool).decode(errors='replace')}")
+                return
+
+        if uploaded:
+            log(f"DUMPED {db} -> {name}")
 
     def _mysql_args(self, cfg):
         args = []
@@ -215,14 +624,19 @@ class MySQLDumpTask(BackupTask):
             args.extend(cfg["extra_args"])
         return args
 
-    def _mysqldump_cmd(self, cfg, db):
-        args = ["mysqldump"] + self._mysql_args(cfg)
-        return args + [db]
-
-    def _list_databases(self, cfg, exclude):
+    def _mysqldump_cmd(self, cfg):
+        dump_flags = cfg.get("dump_flags")
+        if dump_flags is None:
+            dump_flags = self.default_dump_flags
+        args = ["mysqldump"] + list(dump_flags)
+        host = cfg.get("host")
+        if host and str(host) not in self.local_hosts:
+            args.append("--compress")
+        return args + self._mysql_args(cfg)
+
+    def _list_databases(self, cfg, exclude, env):
         cmd = ["mysql"] + self._mysql_args(cfg) + ["-N", "-e", "SHOW DATABASES"]
-        env = self._mysql_env(cfg)
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+        result = run_command(cmd, env=env)
         if result.returncode != 0:
             log(f"ERROR listing databases: {result.stderr.decode(errors='replace')}")
             return []
@@ -243,85 +657,98 @@ class MySQLDumpTask(BackupTask):
 
 
 class PostgresDumpTask(BackupTask):
-    def __init__(self, source_config, destinations, encryptions, compressor, encryptor, uploader):
+    source_type = "pgdump"
+
+    def __init__(self, source_config, destinations, encryptions, compressor, encryptor, uploader, limiter):
         self.source_config = source_config
         self.destinations = destinations or {}
         self.encryptions = encryptions or {}
         self.compressor = compressor
         self.encryptor = encryptor
         self.uploader = uploader
+        self.limiter = limiter
         self.system_databases = ["postgres", "template0", "template1"]
 
-    def run(self):
-        for name in self.source_config:
-            cfg = self.source_config[name]
-            temp_dir = Path(cfg.get("temp", ""))
-            if not str(temp_dir):
-                log(f"ERROR, missing temp path for source {name}")
-                continue
-            temp_dir.mkdir(parents=True, exist_ok=True)
-
-            all_except_system = cfg.get("all_databases_except_system", False)
-            databases = cfg.get("databases") or []
-            if all_except_system:
-                exclude = cfg.get("exclude_databases") or self.system_databases
-                databases = self._list_databases(cfg, exclude)
-                if not databases:
-                    log(f"ERROR, no databases found for source {name}")
-                    continue
-            elif not databases:
-                log(f"ERROR, no databases listed for source {name}")
-                continue
+    def run_source(self, name, cfg):
+        temp_dir = self._temp_dir(name, cfg)
+        if not temp_dir:
+            return
 
-            compress_method = cfg.get("compress")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-
-            for db in databases:
-                dump_file = temp_dir / f"{db}_{timestamp}.sql"
-                cmd = ["pg_dump"] + self._pg_args(cfg, db)
-                env = self._pg_env(cfg)
-
-                with open(dump_file, "wb") as f:
-                    result = subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE, env=env)
-
-                if result.returncode != 0:
-                    log(f"Error dumping {db}: {result.stderr.decode(errors='replace')}")
-                    continue
-
-                log(f"DUMPED {db} -> {dump_file}")
-
-                if compress_method:
-                    compressed_file = self.compressor.compress(dump_file, compress_method)
-                    if not compressed_file:
-                        continue
-                    dump_file = compressed_file
-
-                encryption_key = cfg.get("encryption")
-                if encryption_key:
-                    encryption_cfg = self.encryptions.get(encryption_key)
-                    if not encryption_cfg:
-                        log(f"ERROR, encryption not found: {encryption_key}")
-                        continue
-                    encrypted_file = self.encryptor.encrypt(dump_file, encryption_cfg)
-                    if not encrypted_file:
-                        continue
-                    if dump_file.exists():
-                        dump_file.unlink()
-                    dump_file = encrypted_file
-
-                destination_key = cfg.get("destination")
-                if destination_key:
-                    destination_cfg = self.destinations.get(destination_key)
-                    if not destination_cfg:
-                        log(f"ERROR, destination not found: {destination_key}")
-                        continue
-                    uploaded = self.uploader.upload(dump_file, destination_cfg)
-                    if uploaded and cfg.get("cleanup", True):
-                        dump_file.unlink()
-                else:
-                    log(f"INFO, no destination configured for {dump_file.name}")
+        env = self._pg_env(cfg)
+        all_except_system = cfg.get("all_databases_except_system", False)
+        databases = cfg.get("databases") or []
+        if all_except_system:
+            exclude = cfg.get("exclude_databases") or self.system_databases
+            databases = self._list_databases(cfg, exclude, env)
+            if not databases:
+                log(f"ERROR, no databases found for source {name}")
+                return
+        elif not databases:
+            log(f"ERROR, no databases listed for source {name}")
+            return
+
+        timestamp = time.strftime("%Y%m%d_%H%M", time.localtime())
+        dump_cmd = ["pg_dump"] + self._pg_args(cfg)
+
+        workers = min(max(1, int(cfg.get("parallel_databases", 4))), self.limiter.size)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self.limiter.run, self._backup_database, cfg, db, temp_dir, timestamp, dump_cmd, env)
+                for db in databases
+            ]
+            for future in futures:
+                future.result()
+
+    def _backup_database(self, cfg, db, temp_dir, timestamp, dump_cmd, env):
+        compress_method = cfg.get("compress")
+        dump_file = temp_dir / f"{db}_{timestamp}.sql"
+
+        with open(dump_file, "wb") as f:
+            result = run_command(dump_cmd + ["-d", str(db)], stdout=f, env=env)
+
+        if result.returncode != 0:
+            log(f"Error dumping {db}: {result.stderr.decode(errors='replace')}")
+            return
+
+        log(f"DUMPED {db} -> {dump_file}")
+
+        if compress_method:
+            compressed_file = self.compressor.compress(
+                dump_file,
+                compress_method,
+                cfg.get("compress_threads"),
+                cfg.get("compress_level"),
+            )
+            if not compressed_file:
+                return
+            dump_file = compressed_file
+
+        encryption_key = cfg.get("encryption")
+        if encryption_key:
+            encryption_cfg = self.encryptions.get(encryption_key)
+            if not encryption_cfg:
+                log(f"ERROR, encryption not found: {encryption_key}")
+                return
+            encrypted_file = self.encryptor.encrypt(dump_file, encryption_cfg, bool(compress_method))
+            if not encrypted_file:
+                return
+            if dump_file.exists():
+                dump_file.unlink()
+            dump_file = encrypted_file
+
+        destination_key = cfg.get("destination")
+        if destination_key:
+            destination_cfg = self.destinations.get(destination_key)
+            if not destination_cfg:
+                log(f"ERROR, destination not found: {destination_key}")
+                return
+            uploaded = self.uploader.upload(dump_file, destination_cfg)
+            if uploaded and cfg.get("cleanup", True):
+                dump_file.unlink()
+        else:
+            log(f"INFO, no destination configured for {dump_file.name}")
 
-    def _pg_args(self, cfg, db):
+    def _pg_args(self, cfg):
         args = []
         if cfg.get("host"):
             args.extend(["-h", str(cfg["host"])])
@@ -331,7 +758,6 @@ class PostgresDumpTask(BackupTask):
             args.extend(["-U", str(cfg["user"])])
         if cfg.get("extra_args"):
             args.extend(cfg["extra_args"])
-        args.extend(["-d", str(db)])
         return args
 
     def _pg_env(self, cfg):
@@ -340,10 +766,9 @@ class PostgresDumpTask(BackupTask):
             env["PGPASSWORD"] = str(cfg["password"])
         return env
 
-    def _list_databases(self, cfg, exclude):
+    def _list_databases(self, cfg, exclude, env):
         cmd = ["psql"] + self._psql_args(cfg) + ["-At", "-c", "SELECT datname FROM pg_database WHERE datistemplate = false;"]
-        env = self._pg_env(cfg)
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+        result = run_command(cmd, env=env)
         if result.returncode != 0:
             log(f"ERROR listing databases: {result.stderr.decode(errors='replace')}")
             return []
@@ -368,78 +793,82 @@ class PostgresDumpTask(BackupTask):
 
 
 class DirectoryBackupTask(BackupTask):
-    def __init__(self, source_config, destinations, encryptions, compressor, encryptor, uploader):
+    source_type = "directories"
+
+    def __init__(self, source_config, destinations, encryptions, compressor, encryptor, uploader, limiter):
         self.source_config = source_config
         self.destinations = destinations or {}
         self.encryptions = encryptions or {}
         self.compressor = compressor
         self.encryptor = encryptor
         self.uploader = uploader
-
-    def run(self):
-        for name in self.source_config:
-            cfg = self.source_config[name]
-            source_dir = Path(cfg.get("path", ""))
-            if not source_dir.is_dir():
-                log(f"ERROR, invalid source path for {name}: {source_dir}")
-                continue
-
-            temp_dir = Path(cfg.get("temp", ""))
-            if not str(temp_dir):
-                log(f"ERROR, missing temp path for source {name}")
-                continue
-            temp_dir.mkdir(parents=True, exist_ok=True)
-
-            compress_method = cfg.get("compress")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-            archive_name = self._archive_name(source_dir.name, timestamp, compress_method)
-            archive_path = temp_dir / archive_name
-
-            cmd = self._tar_cmd(cfg, source_dir, archive_path, compress_method)
-            if not cmd:
-                continue
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            if result.returncode != 0:
-                log(f"ERROR creating archive {archive_name}: {result.stderr.decode(errors='replace')}")
-                continue
-
-            log(f"ARCHIVED {source_dir} -> {archive_path}")
-
-            encryption_key = cfg.get("encryption")
-            if encryption_key:
-                encryption_cfg = self.encryptions.get(encryption_key)
-                if not encryption_cfg:
-                    log(f"ERROR, encryption not found: {encryption_key}")
-                    continue
-                encrypted_file = self.encryptor.encrypt(archive_path, encryption_cfg)
-                if not encrypted_file:
-                    continue
-                if archive_path.exists():
-                    archive_path.unlink()
-                archive_path = encrypted_file
-
-            destination_key = cfg.get("destination")
-            if destination_key:
-                destination_cfg = self.destinations.get(destination_key)
-                if not destination_cfg:
-                    log(f"ERROR, destination not found: {destination_key}")
-                    continue
-                uploaded = self.uploader.upload(archive_path, destination_cfg)
-                if uploaded and cfg.get("cleanup", True):
-                    archive_path.unlink()
-            else:
-                log(f"INFO, no destination configured for {archive_path.name}")
+        self.limiter = limiter
+
+    def run_source(self, name, cfg):
+        self.limiter.run(self._backup_directory, name, cfg)
+
+    def _backup_directory(self, name, cfg):
+        source_dir = Path(cfg.get("path", ""))
+        if not source_dir.is_dir():
+            log(f"ERROR, invalid source path for {name}: {source_dir}")
+            return
+
+        temp_dir = self._temp_dir(name, cfg)
+        if not temp_dir:
+            return
+
+        compress_method = cfg.get("compress")
+        timestamp = time.strftime("%Y%m%d_%H%M", time.localtime())
+        archive_name = self._archive_name(source_dir.name, timestamp, compress_method)
+        archive_path = temp_dir / archive_name
+
+        cmd = self._tar_cmd(cfg, source_dir, archive_path, compress_method)
+        if not cmd:
+            return
+        result = run_command(cmd)
+        if result.returncode != 0:
+            log(f"ERROR creating archive {archive_name}: {result.stderr.decode(errors='replace')}")
+            return
+
+        log(f"ARCHIVED {source_dir} -> {archive_path}")
+
+        encryption_key = cfg.get("encryption")
+        if encryption_key:
+            encryption_cfg = self.encryptions.get(encryption_key)
+            if not encryption_cfg:
+                log(f"ERROR, encryption not found: {encryption_key}")
+                return
+            encrypted_file = self.encryptor.encrypt(archive_path, encryption_cfg, bool(compress_method))
+            if not encrypted_file:
+                return
+            if archive_path.exists():
+                archive_path.unlink()
+            archive_path = encrypted_file
+
+        destination_key = cfg.get("destination")
+        if destination_key:
+            destination_cfg = self.destinations.get(destination_key)
+            if not destination_cfg:
+                log(f"ERROR, destination not found: {destination_key}")
+                return
+            uploaded = self.uploader.upload(archive_path, destination_cfg)
+            if uploaded and cfg.get("cleanup", True):
+                archive_path.unlink()
+        else:
+            log(f"INFO, no destination configured for {archive_path.name}")
 
     def _tar_cmd(self, cfg, source_dir, archive_path, compress_method):
         args = ["tar"]
-        if compress_method == "gzip":
-            args.append("-czf")
-        elif compress_method == "bzip2":
-            args.append("-cjf")
-        else:
-            args.append("-cf")
+        if compress_method:
+            program = self.compressor.command(
+                compress_method, cfg.get("compress_threads"), cfg.get("compress_level")
+            )
+            if not program:
+                log(f"ERROR, not supported: {compress_method}")
+                return None
+            args.append(f"--use-compress-program={' '.join(program)}")
 
-        args.append(str(archive_path))
+        args.extend(["-cf", str(archive_path)])
 
         if cfg.get("incremental"):
             snapshot = cfg.get("incremental_snapshot")
@@ -458,13 +887,17 @@ class DirectoryBackupTask(BackupTask):
             return f"{base_name}_{timestamp}.tar.gz"
         if compress_method == "bzip2":
             return f"{base_name}_{timestamp}.tar.bz2"
+        if compress_method == "zstd":
+            return f"{base_name}_{timestamp}.tar.zst"
         return f"{base_name}_{timestamp}.tar"
 
 
 class BackupRunner:
     def __init__(self, config):
         self.config = config
-        self.compressor = Compressor()
+        # Caps dumps/archives running at once across all sources; compressor threads are split between them.
+        self.limiter = JobLimiter(max(1, int(config.get("parallel_jobs", 4))))
+        self.compressor = Compressor(max(1, (os.cpu_count() or 1) // self.limiter.size))
         self.encryptor = Encryptor()
         self.uploader = Uploader()
 
@@ -484,6 +917,7 @@ class BackupRunner:
                         self.compressor,
                         self.encryptor,
                         self.uploader,
+                        self.limiter,
                     )
                 )
             elif source_type == "pgdump":
@@ -495,6 +929,7 @@ class BackupRunner:
                         self.compressor,
                         self.encryptor,
                         self.uploader,
+                        self.limiter,
                     )
                 )
             elif source_type == "directories":
@@ -506,6 +941,7 @@ class BackupRunner:
                         self.compressor,
                         self.encryptor,
                         self.uploader,
+                        self.limiter,
                     )
                 )
             else:
@@ -514,8 +950,15 @@ class BackupRunner:
 
     def run(self):
         tasks = self.build_tasks()
-        for task in tasks:
-            task.run()
+        if not tasks:
+            return
+        try:
+            with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+                futures = [pool.submit(task.run) for task in tasks]
+                for future in futures:
+                    future.result()
+        finally:
+            self.uploader.close()
 
 
 if __name__ == "__main__":